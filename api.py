@@ -1,14 +1,85 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 import hashlib
 import hmac
 import base64
 
+# 발급받은 토큰을 프로세스 재시작 간에 재사용하기 위한 캐시 파일
+# (KIS는 토큰 발급을 분당 1회로 제한하므로 매 생성마다 발급하면 안 됨)
+_TOKEN_PATH = Path.home() / ".kis_token.json"
+
+# orjson이 설치되어 있으면 사용 (stdlib json 대비 수 배 빠른 인코딩/디코딩)
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)  # bytes 반환 (utf-8 인코딩 단계 생략)
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    def _json_loads(data):
+        return json.loads(data)
+
+# ijson이 설치되어 있으면 큰 차트 응답을 스트리밍으로 파싱
+# (전체 JSON 트리를 메모리에 올리지 않고 필요한 봉 개수에서 중단)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class TokenBucket:
+    """토큰 버킷 방식 클라이언트측 속도 제한기
+
+    KIS의 초당 호출 제한을 넘기 전에 클라이언트에서 요청 간격을 조절한다.
+    한도를 넘겨 에러 응답을 받고 재시도하는 것보다 싸다.
+
+    Args:
+        rate: 초당 보충되는 토큰 수 (허용 요청/초)
+        cap: 버킷 최대 크기 (순간 버스트 허용량)
+    """
+
+    def __init__(self, rate, cap):
+        self.rate = rate
+        self.cap = cap
+        self.tokens = cap
+        self.ts = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 획득 (부족하면 보충될 때까지 대기)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.cap, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            if self.tokens < 1:
+                sleep = (1 - self.tokens) / self.rate
+                time.sleep(sleep)
+                # 기준 시각을 대기 이후로 갱신 (안 하면 다음 호출이 방금
+                # 잔 구간을 한 번 더 보충받아 설정 속도의 ~2배가 나감)
+                self.ts = time.monotonic()
+                self.tokens = 0
+            else:
+                self.tokens -= 1
+
 
 class KISOpenAPI:
+    # 봉 1개가 차지하는 달력 일수 (주말/공휴일 여유 포함) — 차트 조회
+    # 날짜 범위를 요청 봉 개수에 맞게 산정하는 데 사용
+    _CHART_SPAN_DAYS = {"D": 2, "W": 9, "M": 40}
+
     def __init__(self, app_key, app_secret, account_no, is_real=False):
         """
         한국투자증권 오픈API 클래스
@@ -30,11 +101,115 @@ class KISOpenAPI:
         else:
             self.base_url = "https://openapivts.koreainvestment.com:29443"
 
+        # 커넥션 풀링 세션 (매 요청마다 TCP+TLS 핸드셰이크 방지)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+
         self.access_token = None
         self.token_expired = None
 
-        # 최초 토큰 발급
-        self.get_access_token()
+        # 클라이언트측 속도 제한 (시세 20건/초, 주문 1건/초)
+        self._quote_bucket = TokenBucket(20, 20)
+        self._order_bucket = TokenBucket(1, 2)
+
+        # 계좌번호 분리 및 헤더 캐시 (매 호출마다 split/dict 재생성 방지)
+        self._cano, self._acnt_prdt_cd = account_no.split('-')
+        self._header_base = {}
+        self._header_cache = {}
+
+        # 자주 쓰는 URL 템플릿 (매 호출마다 f-string/urlencode 재생성 방지)
+        # 종목코드는 숫자라 퍼센트 인코딩이 필요 없어 문자열 연결로 충분
+        self._quote_url = (f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
+                           f"?FID_COND_MRKT_DIV_CODE=J&FID_INPUT_ISCD=")
+        self._chart_url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        self._balance_url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-balance"
+        self._order_url = f"{self.base_url}/uapi/domestic-stock/v1/trading/order-cash"
+
+        # 주문 본문 템플릿 (매 주문마다 불변 필드 재구성 방지)
+        self._order_template = {
+            "CANO": self._cano,
+            "ACNT_PRDT_CD": self._acnt_prdt_cd,
+            "PDNO": "",
+            "ORD_DVSN": "",
+            "ORD_QTY": "",
+            "ORD_UNPR": ""
+        }
+
+        # 최초 토큰 발급 (디스크에 유효한 토큰이 있으면 재사용)
+        if not self._load_cached_token():
+            self.get_access_token()
+
+    def _token_cache_key(self):
+        """토큰 캐시 키 (환경 + 앱키별로 구분)"""
+        return f"{self.is_real}:{self.app_key}"
+
+    def _set_token(self, access_token, token_expired):
+        """토큰 설정 및 헤더 템플릿/캐시 재생성"""
+        self.access_token = access_token
+        self.token_expired = token_expired
+        self._header_base = {
+            "Content-Type": "application/json; charset=utf-8",
+            # 압축 응답 허용 (requests가 투명하게 해제, 차트/잔고 응답 크기 대폭 감소)
+            "Accept-Encoding": "gzip, deflate",
+            "authorization": f"Bearer {self.access_token}",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret
+        }
+        self._header_cache.clear()
+
+    def _load_cached_token(self):
+        """디스크에 캐시된 토큰이 유효하면 재사용"""
+        try:
+            cache = _json_loads(_TOKEN_PATH.read_bytes())
+            entry = cache.get(self._token_cache_key())
+            if not entry:
+                return False
+
+            expired = datetime.strptime(entry["token_expired"], "%Y-%m-%d %H:%M:%S")
+            if expired <= datetime.now() + timedelta(seconds=60):
+                return False
+
+            self._set_token(entry["access_token"], entry["token_expired"])
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def _save_cached_token(self):
+        """토큰을 디스크에 저장 (임시 파일 후 원자적 교체)"""
+        try:
+            cache = {}
+            if _TOKEN_PATH.exists():
+                try:
+                    cache = _json_loads(_TOKEN_PATH.read_bytes())
+                except ValueError:
+                    cache = {}
+
+            cache[self._token_cache_key()] = {
+                "access_token": self.access_token,
+                "token_expired": self.token_expired
+            }
+
+            tmp_path = _TOKEN_PATH.with_suffix('.tmp')
+            tmp_path.write_bytes(_json_dumps(cache))
+            os.replace(tmp_path, _TOKEN_PATH)
+        except OSError:
+            pass  # 캐시 저장 실패는 치명적이지 않음
+
+    def _ensure_token(self):
+        """토큰 만료 임박 시 선제 갱신"""
+        if self.token_expired:
+            try:
+                expired = datetime.strptime(self.token_expired, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                return
+            if datetime.now() >= expired - timedelta(seconds=60):
+                self.get_access_token()
+
+    def close(self):
+        """세션 종료"""
+        self.session.close()
 
     def get_access_token(self):
         """접근 토큰 발급"""
@@ -50,44 +225,38 @@ class KISOpenAPI:
             "appsecret": self.app_secret
         }
 
-        response = requests.post(url, headers=headers, data=json.dumps(data))
+        response = self.session.post(url, headers=headers, data=_json_dumps(data))
 
         if response.status_code == 200:
-            result = response.json()
-            self.access_token = result["access_token"]
-            self.token_expired = result["access_token_token_expired"]
+            result = _json_loads(response.content)
+            self._set_token(result["access_token"], result["access_token_token_expired"])
+            self._save_cached_token()
             print("토큰 발급 성공")
         else:
             print(f"토큰 발급 실패: {response.status_code}")
             raise Exception("토큰 발급 실패")
 
     def get_headers(self, tr_id, tr_cont=""):
-        """API 요청 헤더 생성"""
-        headers = {
-            "Content-Type": "application/json; charset=utf-8",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-            "tr_id": tr_id,
-            "tr_cont": tr_cont
-        }
+        """API 요청 헤더 생성 (tr_id별 캐시)"""
+        self._ensure_token()
+        headers = self._header_cache.get(tr_id)
+        if headers is None:
+            headers = {**self._header_base, "tr_id": tr_id, "tr_cont": ""}
+            self._header_cache[tr_id] = headers
+        if tr_cont:
+            headers = headers.copy()
+            headers["tr_cont"] = tr_cont
         return headers
 
     def get_current_price(self, stock_code):
         """현재가 조회"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
-
+        self._quote_bucket.acquire()
         headers = self.get_headers("FHKST01010100")
 
-        params = {
-            "FID_COND_MRKT_DIV_CODE": "J",
-            "FID_INPUT_ISCD": stock_code
-        }
-
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(self._quote_url + stock_code, headers=headers)
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data["rt_cd"] == "0":
                 output = data["output"]
                 return {
@@ -98,15 +267,35 @@ class KISOpenAPI:
                 }
         return None
 
-    def get_balance(self):
-        """계좌 잔고 조회"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-balance"
+    def get_current_prices(self, stock_codes):
+        """여러 종목 현재가 병렬 조회
+
+        커넥션 풀을 공유하는 스레드 풀로 동시에 요청하므로
+        N개 종목 조회가 N x RTT가 아닌 ceil(N/8) x RTT에 끝난다.
+
+        Args:
+            stock_codes: 종목코드 리스트
+
+        Returns:
+            get_current_price 결과 리스트 (입력 순서 유지, 실패 시 None 포함)
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(self.get_current_price, stock_codes))
+
+    def get_balance_raw(self):
+        """계좌 잔고 조회 (원시 응답 bytes 반환)
+
+        호출측에서 응답을 해시해 변경 여부만 확인할 수 있도록 파싱
+        전 단계를 분리한 것. 파싱은 parse_balance가 담당한다.
+        """
+        self._quote_bucket.acquire()
+        url = self._balance_url
 
         headers = self.get_headers("TTTC8434R")
 
         params = {
-            "CANO": self.account_no.split('-')[0],
-            "ACNT_PRDT_CD": self.account_no.split('-')[1],
+            "CANO": self._cano,
+            "ACNT_PRDT_CD": self._acnt_prdt_cd,
             "AFHR_FLPR_YN": "N",
             "OFL_YN": "",
             "INQR_DVSN": "02",
@@ -118,17 +307,30 @@ class KISOpenAPI:
             "CTX_AREA_NK100": ""
         }
 
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(url, headers=headers, params=params)
 
         if response.status_code == 200:
-            data = response.json()
-            if data["rt_cd"] == "0":
-                return {
-                    "cash": int(data["output2"][0]["dnca_tot_amt"]),  # 예수금총액
-                    "stocks": data["output1"]  # 보유주식
-                }
+            return response.content
+        return None
+
+    @staticmethod
+    def parse_balance(raw):
+        """잔고 원시 응답 파싱"""
+        data = _json_loads(raw)
+        if data["rt_cd"] == "0":
+            return {
+                "cash": int(data["output2"][0]["dnca_tot_amt"]),  # 예수금총액
+                "stocks": pd.DataFrame(data["output1"])  # 보유주식
+            }
         return None
 
+    def get_balance(self):
+        """계좌 잔고 조회"""
+        raw = self.get_balance_raw()
+        if raw is None:
+            return None
+        return self.parse_balance(raw)
+
     def buy_order(self, stock_code, quantity, price=0, order_type="01"):
         """주식 매수 주문
 
@@ -138,7 +340,8 @@ class KISOpenAPI:
             price: 주문가격 (0이면 시장가)
             order_type: 주문구분 ("01": 지정가, "01": 시장가)
         """
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/order-cash"
+        self._order_bucket.acquire()
+        url = self._order_url
 
         headers = self.get_headers("TTTC0802U")
 
@@ -150,19 +353,16 @@ class KISOpenAPI:
             order_type = "00"  # 지정가
             price = str(price)
 
-        data = {
-            "CANO": self.account_no.split('-')[0],
-            "ACNT_PRDT_CD": self.account_no.split('-')[1],
-            "PDNO": stock_code,
-            "ORD_DVSN": order_type,
-            "ORD_QTY": str(quantity),
-            "ORD_UNPR": price
-        }
+        data = self._order_template.copy()
+        data["PDNO"] = stock_code
+        data["ORD_DVSN"] = order_type
+        data["ORD_QTY"] = str(quantity)
+        data["ORD_UNPR"] = price
 
-        response = requests.post(url, headers=headers, data=json.dumps(data))
+        response = self.session.post(url, headers=headers, data=_json_dumps(data))
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             if result["rt_cd"] == "0":
                 return {
                     "order_no": result["output"]["ORD_NO"],
@@ -178,7 +378,8 @@ class KISOpenAPI:
 
     def sell_order(self, stock_code, quantity, price=0, order_type="01"):
         """주식 매도 주문"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/order-cash"
+        self._order_bucket.acquire()
+        url = self._order_url
 
         headers = self.get_headers("TTTC0801U")
 
@@ -190,19 +391,16 @@ class KISOpenAPI:
             order_type = "00"  # 지정가
             price = str(price)
 
-        data = {
-            "CANO": self.account_no.split('-')[0],
-            "ACNT_PRDT_CD": self.account_no.split('-')[1],
-            "PDNO": stock_code,
-            "ORD_DVSN": order_type,
-            "ORD_QTY": str(quantity),
-            "ORD_UNPR": price
-        }
+        data = self._order_template.copy()
+        data["PDNO"] = stock_code
+        data["ORD_DVSN"] = order_type
+        data["ORD_QTY"] = str(quantity)
+        data["ORD_UNPR"] = price
 
-        response = requests.post(url, headers=headers, data=json.dumps(data))
+        response = self.session.post(url, headers=headers, data=_json_dumps(data))
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             if result["rt_cd"] == "0":
                 return {
                     "order_no": result["output"]["ORD_NO"],
@@ -216,41 +414,79 @@ class KISOpenAPI:
                 }
         return {"success": False, "message": "주문 실패"}
 
-    def get_chart_data(self, stock_code, period="D", count=30):
+    def get_chart_data(self, stock_code, period="D", count=30, since=None):
         """차트 데이터 조회
 
         Args:
             stock_code: 종목코드
             period: 기간 ("D": 일봉, "W": 주봉, "M": 월봉)
             count: 조회할 봉의 개수
+            since: "YYYYMMDD" 기준일 (지정 시 그 이후의 봉만 반환, 증분 조회용)
         """
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        self._quote_bucket.acquire()
+        url = self._chart_url
 
         headers = self.get_headers("FHKST03010100")
 
+        # 필요한 봉 개수만큼만 조회하도록 서버측에 날짜 범위 지정
+        # (주말/공휴일 감안해 여유분 포함, 전체 구간을 받아 버리는 것보다 응답이 작음)
+        end_date = datetime.now()
+        if since:
+            start = since
+        else:
+            # 봉 주기에 따라 달력 일수로 환산 (주봉/월봉은 훨씬 긴 구간 필요)
+            span = self._CHART_SPAN_DAYS.get(period, 2)
+            start = (end_date - timedelta(days=count * span)).strftime("%Y%m%d")
+
         params = {
             "FID_COND_MRKT_DIV_CODE": "J",
             "FID_INPUT_ISCD": stock_code,
-            "FID_INPUT_DATE_1": "",
-            "FID_INPUT_DATE_2": "",
+            "FID_INPUT_DATE_1": start,
+            "FID_INPUT_DATE_2": end_date.strftime("%Y%m%d"),
             "FID_PERIOD_DIV_CODE": period,
             "FID_ORG_ADJ_PRC": "0"
         }
 
-        response = requests.get(url, headers=headers, params=params)
+        # 큰 조회는 스트리밍 파싱, 작은 조회는 전체 파싱이 더 빠름
+        # (ijson의 구동 비용은 소량 데이터에서 오히려 손해)
+        if ijson is not None and count >= 20:
+            response = self.session.get(url, headers=headers, params=params, stream=True)
+            if response.status_code != 200:
+                return None
+            try:
+                response.raw.decode_content = True  # gzip 응답 해제
+                rows = []
+                for item in ijson.items(response.raw, 'output2.item'):
+                    rows.append(item)
+                    if len(rows) >= count:
+                        break
+            finally:
+                response.close()
+            return self._chart_rows_to_records(rows, since)
+
+        response = self.session.get(url, headers=headers, params=params)
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data["rt_cd"] == "0":
-                chart_data = []
-                for item in data["output2"][:count]:
-                    chart_data.append({
-                        "date": item["stck_bsop_date"],
-                        "open": int(item["stck_oprc"]),
-                        "high": int(item["stck_hgpr"]),
-                        "low": int(item["stck_lwpr"]),
-                        "close": int(item["stck_clpr"]),
-                        "volume": int(item["acml_vol"])
-                    })
-                return chart_data
-        return None
\ No newline at end of file
+                return self._chart_rows_to_records(data["output2"][:count], since)
+        return None
+
+    @staticmethod
+    def _chart_rows_to_records(rows, since=None):
+        """KIS 차트 응답 행을 record 리스트로 변환 (C 레벨 일괄 변환)"""
+        if not rows:
+            return None
+        df = pd.DataFrame(rows, columns=[
+            "stck_bsop_date", "stck_oprc", "stck_hgpr",
+            "stck_lwpr", "stck_clpr", "acml_vol"
+        ])
+        df.columns = ["date", "open", "high", "low", "close", "volume"]
+        if since:
+            # 기준일은 서버 조회 범위에 포함되므로 그 이후의 봉만 남김
+            df = df[df["date"] > since]
+            if df.empty:
+                return None
+        num_cols = ["open", "high", "low", "close", "volume"]
+        df[num_cols] = df[num_cols].astype("int64")
+        return df.to_dict("records")
\ No newline at end of file
@@ -0,0 +1,227 @@
+import asyncio
+import json
+
+import httpx
+
+
+class AsyncKISOpenAPI:
+    def __init__(self, app_key, app_secret, account_no, is_real=False, max_concurrency=16):
+        """
+        한국투자증권 오픈API 비동기 클래스
+
+        httpx.AsyncClient 기반으로 여러 종목의 시세/차트를 동시에 조회한다.
+        순차 조회 시 N x RTT 걸리던 작업을 asyncio.gather로 ~RTT 수준까지 단축.
+
+        Args:
+            app_key: API 키
+            app_secret: API 시크릿
+            account_no: 계좌번호 (8자리-2자리)
+            is_real: 실제투자(True) vs 모의투자(False)
+            max_concurrency: 동시 요청 수 제한
+        """
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.account_no = account_no
+        self.is_real = is_real
+
+        # API 기본 URL 설정
+        if is_real:
+            self.base_url = "https://openapi.koreainvestment.com:9443"
+        else:
+            self.base_url = "https://openapivts.koreainvestment.com:29443"
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=30
+        )
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+        self.access_token = None
+        self.token_expired = None
+
+    async def aclose(self):
+        """클라이언트 종료"""
+        await self._client.aclose()
+
+    async def get_access_token(self):
+        """접근 토큰 발급"""
+        data = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret
+        }
+
+        response = await self._client.post(
+            "/oauth2/tokenP",
+            headers={"content-type": "application/json"},
+            content=json.dumps(data)
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            self.access_token = result["access_token"]
+            self.token_expired = result["access_token_token_expired"]
+            print("토큰 발급 성공")
+        else:
+            print(f"토큰 발급 실패: {response.status_code}")
+            raise Exception("토큰 발급 실패")
+
+    async def _ensure_token(self):
+        """토큰이 없으면 발급"""
+        if self.access_token is None:
+            await self.get_access_token()
+
+    def get_headers(self, tr_id, tr_cont=""):
+        """API 요청 헤더 생성"""
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "authorization": f"Bearer {self.access_token}",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+            "tr_id": tr_id,
+            "tr_cont": tr_cont
+        }
+        return headers
+
+    async def get_current_price(self, stock_code):
+        """현재가 조회"""
+        await self._ensure_token()
+
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": stock_code
+        }
+
+        response = await self._client.get(
+            "/uapi/domestic-stock/v1/quotations/inquire-price",
+            headers=self.get_headers("FHKST01010100"),
+            params=params
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            if data["rt_cd"] == "0":
+                output = data["output"]
+                return {
+                    "stock_code": stock_code,
+                    "current_price": int(output["stck_prpr"]),
+                    "change_rate": float(output["prdy_ctrt"]),
+                    "volume": int(output["acml_vol"])
+                }
+        return None
+
+    async def get_chart_data(self, stock_code, period="D", count=30):
+        """차트 데이터 조회
+
+        Args:
+            stock_code: 종목코드
+            period: 기간 ("D": 일봉, "W": 주봉, "M": 월봉)
+            count: 조회할 봉의 개수
+        """
+        await self._ensure_token()
+
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": stock_code,
+            "FID_INPUT_DATE_1": "",
+            "FID_INPUT_DATE_2": "",
+            "FID_PERIOD_DIV_CODE": period,
+            "FID_ORG_ADJ_PRC": "0"
+        }
+
+        response = await self._client.get(
+            "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
+            headers=self.get_headers("FHKST03010100"),
+            params=params
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            if data["rt_cd"] == "0":
+                chart_data = []
+                for item in data["output2"][:count]:
+                    chart_data.append({
+                        "date": item["stck_bsop_date"],
+                        "open": int(item["stck_oprc"]),
+                        "high": int(item["stck_hgpr"]),
+                        "low": int(item["stck_lwpr"]),
+                        "close": int(item["stck_clpr"]),
+                        "volume": int(item["acml_vol"])
+                    })
+                return chart_data
+        return None
+
+    async def _submit_order(self, tr_id, stock_code, quantity, price, success_message):
+        """주문 공통 처리 (매수/매도)"""
+        await self._ensure_token()
+
+        # 시장가 주문인 경우
+        if price == 0:
+            order_type = "01"  # 시장가
+            price = "0"
+        else:
+            order_type = "00"  # 지정가
+            price = str(price)
+
+        cano, acnt_prdt_cd = self.account_no.split('-')
+        data = {
+            "CANO": cano,
+            "ACNT_PRDT_CD": acnt_prdt_cd,
+            "PDNO": stock_code,
+            "ORD_DVSN": order_type,
+            "ORD_QTY": str(quantity),
+            "ORD_UNPR": price
+        }
+
+        response = await self._client.post(
+            "/uapi/domestic-stock/v1/trading/order-cash",
+            headers=self.get_headers(tr_id),
+            content=json.dumps(data)
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            if result["rt_cd"] == "0":
+                return {
+                    "order_no": result["output"]["ORD_NO"],
+                    "success": True,
+                    "message": success_message
+                }
+            else:
+                return {
+                    "success": False,
+                    "message": result["msg1"]
+                }
+        return {"success": False, "message": "주문 실패"}
+
+    async def buy_order(self, stock_code, quantity, price=0):
+        """주식 매수 주문
+
+        Args:
+            stock_code: 종목코드
+            quantity: 주문수량
+            price: 주문가격 (0이면 시장가)
+        """
+        return await self._submit_order("TTTC0802U", stock_code, quantity, price, "매수 주문 성공")
+
+    async def sell_order(self, stock_code, quantity, price=0):
+        """주식 매도 주문"""
+        return await self._submit_order("TTTC0801U", stock_code, quantity, price, "매도 주문 성공")
+
+    async def get_current_prices(self, stock_codes):
+        """여러 종목 현재가 동시 조회"""
+        async def one(code):
+            async with self._sem:
+                return await self.get_current_price(code)
+
+        return await asyncio.gather(*(one(code) for code in stock_codes))
+
+    async def get_chart_data_many(self, stock_codes, period="D", count=30):
+        """여러 종목 차트 데이터 동시 조회"""
+        async def one(code):
+            async with self._sem:
+                return await self.get_chart_data(code, period, count)
+
+        return await asyncio.gather(*(one(code) for code in stock_codes))
@@ -1,10 +1,32 @@
 import requests
+from requests.adapters import HTTPAdapter
 import socket
 import ssl
 import time
 from urllib.parse import urlparse
+import asyncio
 import subprocess
 import platform
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+@dataclass
+class DiagResult:
+    """개별 진단 항목 결과"""
+    name: str
+    ok: bool
+    detail: str
+
+
+def _make_session():
+    """커넥션 풀링이 설정된 requests 세션 생성"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8)
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
 
 
 class ConnectionDiagnostic:
@@ -14,34 +36,44 @@ class ConnectionDiagnostic:
         self.real_api_url = "https://openapi.koreainvestment.com:9443"
         self.vts_api_url = "https://openapivts.koreainvestment.com:29443"
 
+        # 진단 요청 간 TLS 핸드셰이크를 반복하지 않도록 세션 재사용
+        self._diag_session = _make_session()
+
+        # 같은 호스트에 대한 중복 DNS 조회 방지 캐시
+        self._dns_cache = {}
+
+        # SSL 컨텍스트 재사용 (반복 점검 시 컨텍스트 생성/검증 데이터 로드 비용 절감)
+        self._ssl_ctx = ssl.create_default_context()
+
+    def _resolve(self, host):
+        """호스트명을 IP로 해석 (결과 캐시)"""
+        ip = self._dns_cache.get(host)
+        if ip is None:
+            ip = socket.gethostbyname(host)
+            self._dns_cache[host] = ip
+        return ip
+
     def check_internet_connection(self):
         """인터넷 연결 상태 확인"""
-        print("=== 인터넷 연결 상태 확인 ===")
         try:
             # Google DNS로 연결 테스트
             socket.create_connection(("8.8.8.8", 53), timeout=5)
-            print("✓ 인터넷 연결 정상")
-            return True
+            return DiagResult('internet', True, "인터넷 연결 정상")
         except OSError:
-            print("✗ 인터넷 연결 실패")
-            return False
+            return DiagResult('internet', False, "인터넷 연결 실패")
 
     def check_dns_resolution(self, url):
         """DNS 해석 확인"""
-        print(f"\n=== DNS 해석 확인: {url} ===")
         try:
             parsed_url = urlparse(url)
             host = parsed_url.hostname
-            ip = socket.gethostbyname(host)
-            print(f"✓ DNS 해석 성공: {host} -> {ip}")
-            return True
+            ip = self._resolve(host)
+            return DiagResult('dns', True, f"{host} -> {ip}")
         except socket.gaierror as e:
-            print(f"✗ DNS 해석 실패: {e}")
-            return False
+            return DiagResult('dns', False, f"DNS 해석 실패: {e}")
 
     def check_port_connectivity(self, url):
         """포트 연결 확인"""
-        print(f"\n=== 포트 연결 확인: {url} ===")
         try:
             parsed_url = urlparse(url)
             host = parsed_url.hostname
@@ -49,69 +81,95 @@ class ConnectionDiagnostic:
 
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(10)
-            result = sock.connect_ex((host, port))
+            result = sock.connect_ex((self._resolve(host), port))
             sock.close()
 
             if result == 0:
-                print(f"✓ 포트 연결 성공: {host}:{port}")
-                return True
-            else:
-                print(f"✗ 포트 연결 실패: {host}:{port}")
-                return False
+                return DiagResult('port', True, f"{host}:{port} 연결 성공")
+            return DiagResult('port', False, f"{host}:{port} 연결 실패")
         except Exception as e:
-            print(f"✗ 포트 연결 오류: {e}")
-            return False
+            return DiagResult('port', False, f"포트 연결 오류: {e}")
 
     def check_ssl_certificate(self, url):
         """SSL 인증서 확인"""
-        print(f"\n=== SSL 인증서 확인: {url} ===")
         try:
             parsed_url = urlparse(url)
             host = parsed_url.hostname
             port = parsed_url.port or 443
 
-            context = ssl.create_default_context()
-            sock = socket.create_connection((host, port), timeout=10)
-            ssock = context.wrap_socket(sock, server_hostname=host)
-
-            cert = ssock.getpeercert()
-            print(f"✓ SSL 인증서 확인 성공")
-            print(f"  발급자: {cert.get('issuer', [{}])[0].get('organizationName', 'Unknown')}")
-            print(f"  유효기간: {cert.get('notAfter', 'Unknown')}")
+            context = self._ssl_ctx
+            with socket.create_connection((self._resolve(host), port), timeout=10) as sock, \
+                    context.wrap_socket(sock, server_hostname=host) as ssock:
+                cert = ssock.getpeercert()
+                issuer = cert.get('issuer', [[('organizationName', 'Unknown')]])[0]
+                detail = (f"발급자: {dict(issuer).get('organizationName', 'Unknown')}, "
+                          f"유효기간: {cert.get('notAfter', 'Unknown')}")
 
-            ssock.close()
-            return True
+            return DiagResult('ssl', True, detail)
         except Exception as e:
-            print(f"✗ SSL 인증서 확인 실패: {e}")
-            return False
+            return DiagResult('ssl', False, f"SSL 인증서 확인 실패: {e}")
 
     def test_http_request(self, url, timeout=30):
         """HTTP 요청 테스트"""
-        print(f"\n=== HTTP 요청 테스트: {url} ===")
         try:
             # 간단한 GET 요청으로 연결 테스트
-            response = requests.get(
+            response = self._diag_session.get(
                 f"{url}/",
                 timeout=timeout,
                 verify=True,
                 headers={'User-Agent': 'KIS-API-Test/1.0'}
             )
 
-            print(f"✓ HTTP 요청 성공: {response.status_code}")
-            return True
+            return DiagResult('http', True, f"HTTP {response.status_code}")
 
         except requests.exceptions.ConnectTimeout:
-            print("✗ 연결 타임아웃")
-            return False
+            return DiagResult('http', False, "연결 타임아웃")
         except requests.exceptions.ReadTimeout:
-            print("✗ 응답 타임아웃")
-            return False
+            return DiagResult('http', False, "응답 타임아웃")
         except requests.exceptions.ConnectionError as e:
-            print(f"✗ 연결 오류: {e}")
-            return False
+            return DiagResult('http', False, f"연결 오류: {e}")
+        except Exception as e:
+            return DiagResult('http', False, f"HTTP 요청 오류: {e}")
+
+    async def _probe_tls(self, host, port):
+        """TCP 연결과 TLS 핸드셰이크를 한 번에 수행하고 피어 인증서 반환"""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self._resolve(host), port,
+                ssl=self._ssl_ctx, server_hostname=host
+            ),
+            timeout=10
+        )
+        try:
+            return writer.get_extra_info('peercert')
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    def check_port_and_ssl(self, url):
+        """포트 연결 + SSL 인증서 통합 확인
+
+        같은 host:port에 TCP 연결을 두 번 여는 대신 핸드셰이크 한 번으로
+        연결성과 인증서를 모두 확인한다.
+        """
+        parsed_url = urlparse(url)
+        host = parsed_url.hostname
+        port = parsed_url.port or 443
+
+        try:
+            cert = asyncio.run(self._probe_tls(host, port))
+            issuer = cert.get('issuer', [[('organizationName', 'Unknown')]])[0]
+            detail = (f"발급자: {dict(issuer).get('organizationName', 'Unknown')}, "
+                      f"유효기간: {cert.get('notAfter', 'Unknown')}")
+            return (DiagResult('port', True, f"{host}:{port} 연결 성공"),
+                    DiagResult('ssl', True, detail))
+        except ssl.SSLError as e:
+            # TCP는 연결됐지만 TLS 핸드셰이크 실패
+            return (DiagResult('port', True, f"{host}:{port} 연결 성공"),
+                    DiagResult('ssl', False, f"SSL 인증서 확인 실패: {e}"))
         except Exception as e:
-            print(f"✗ HTTP 요청 오류: {e}")
-            return False
+            return (DiagResult('port', False, f"{host}:{port} 연결 실패: {e}"),
+                    DiagResult('ssl', False, f"SSL 인증서 확인 실패: {e}"))
 
     def check_firewall_and_proxy(self):
         """방화벽 및 프록시 설정 확인"""
@@ -145,30 +203,33 @@ class ConnectionDiagnostic:
             except:
                 print("방화벽 상태를 확인할 수 없습니다.")
 
-    def ping_test(self, host):
-        """핑 테스트"""
-        print(f"\n=== 핑 테스트: {host} ===")
+    def ping_test(self, host, port=443, count=4):
+        """핑 테스트 (TCP 연결 시간 측정)
+
+        ICMP는 방화벽에서 차단되는 경우가 많고 서브프로세스 fork 비용도 크므로,
+        실제 API 포트에 대한 TCP 연결 시간을 측정한다.
+        """
         try:
-            if platform.system() == "Windows":
-                cmd = ["ping", "-n", "4", host]
-            else:
-                cmd = ["ping", "-c", "4", host]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            if result.returncode == 0:
-                print("✓ 핑 테스트 성공")
-                return True
-            else:
-                print("✗ 핑 테스트 실패")
-                return False
-
-        except subprocess.TimeoutExpired:
-            print("✗ 핑 테스트 타임아웃")
-            return False
+            times = []
+            for _ in range(count):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.settimeout(2)
+                start = time.perf_counter()
+                try:
+                    sock.connect((self._resolve(host), port))
+                    times.append((time.perf_counter() - start) * 1000)
+                except OSError:
+                    pass
+                finally:
+                    sock.close()
+
+            if times:
+                return DiagResult('ping', True, f"TCP 평균 {sum(times) / len(times):.1f}ms")
+
+            return DiagResult('ping', False, "핑 테스트 실패")
+
         except Exception as e:
-            print(f"✗ 핑 테스트 오류: {e}")
-            return False
+            return DiagResult('ping', False, f"핑 테스트 오류: {e}")
 
     def run_full_diagnostic(self, is_real=False):
         """전체 진단 실행"""
@@ -177,42 +238,42 @@ class ConnectionDiagnostic:
         print("=" * 60)
 
         target_url = self.real_api_url if is_real else self.vts_api_url
-        target_host = urlparse(target_url).hostname
-
-        results = {}
-
-        # 1. 인터넷 연결 확인
-        results['internet'] = self.check_internet_connection()
-
-        # 2. DNS 해석 확인
-        results['dns'] = self.check_dns_resolution(target_url)
-
-        # 3. 핑 테스트
-        results['ping'] = self.ping_test(target_host)
-
-        # 4. 포트 연결 확인
-        results['port'] = self.check_port_connectivity(target_url)
-
-        # 5. SSL 인증서 확인
-        results['ssl'] = self.check_ssl_certificate(target_url)
-
-        # 6. HTTP 요청 테스트
-        results['http'] = self.test_http_request(target_url)
-
-        # 7. 방화벽 및 프록시 확인
+        parsed = urlparse(target_url)
+        target_host = parsed.hostname
+        # KIS는 443이 아닌 9443/29443으로 서비스하므로 실제 API 포트로 측정
+        target_port = parsed.port or 443
+
+        # 각 점검은 서로 독립적인 I/O 작업이므로 동시에 실행
+        # (전체 소요 시간이 타임아웃의 합이 아닌 최대값으로 줄어듦)
+        tasks = {
+            'internet': (self.check_internet_connection,),
+            'dns': (self.check_dns_resolution, target_url),
+            'ping': (self.ping_test, target_host, target_port),
+            'http': (self.test_http_request, target_url),
+        }
+
+        with ThreadPoolExecutor(max_workers=len(tasks) + 1) as executor:
+            futures = {name: executor.submit(fn, *args)
+                       for name, (fn, *args) in tasks.items()}
+            # 포트/SSL은 핸드셰이크 한 번으로 함께 확인
+            port_ssl_future = executor.submit(self.check_port_and_ssl, target_url)
+            results = {name: future.result() for name, future in futures.items()}
+            results['port'], results['ssl'] = port_ssl_future.result()
+
+        # 방화벽 및 프록시 확인
         self.check_firewall_and_proxy()
 
-        # 결과 요약
-        print("\n" + "=" * 60)
-        print("진단 결과 요약")
-        print("=" * 60)
-
-        for test, result in results.items():
-            status = "✓ 통과" if result else "✗ 실패"
-            print(f"{test.upper()}: {status}")
+        # 결과 요약 (검사당 print 대신 한 번에 조립해서 한 번만 출력)
+        report = ["", "=" * 60, "진단 결과 요약", "=" * 60]
+        report.extend(
+            f"{r.name.upper()}: {'✓ 통과' if r.ok else '✗ 실패'} - {r.detail}"
+            for r in results.values()
+        )
+        sys.stdout.write("\n".join(report) + "\n")
+        sys.stdout.flush()
 
         # 해결 방안 제시
-        failed_tests = [test for test, result in results.items() if not result]
+        failed_tests = [name for name, r in results.items() if not r.ok]
 
         if failed_tests:
             print(f"\n실패한 테스트: {', '.join(failed_tests)}")
@@ -268,7 +329,7 @@ def test_with_different_settings():
         "https://openapi.koreainvestment.com:9443"  # 실제투자
     ]
 
-    session = requests.Session()
+    session = _make_session()
 
     # 다양한 설정으로 테스트
     configs = [
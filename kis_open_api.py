@@ -1,5 +1,7 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import random
 import time
 import pandas as pd
 from datetime import datetime
@@ -30,12 +32,22 @@ class KISOpenAPI:
         else:
             self.base_url = "https://openapivts.koreainvestment.com:29443"
 
+        # 커넥션 풀링 세션 (매 요청마다 TCP+TLS 핸드셰이크 방지)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+
         self.access_token = None
         self.token_expired = None
 
         # 최초 토큰 발급
         self.get_access_token()
 
+    def close(self):
+        """세션 종료"""
+        self.session.close()
+
     def get_access_token(self):
         """접근 토큰 발급"""
         url = f"{self.base_url}/oauth2/tokenP"
@@ -58,7 +70,7 @@ class KISOpenAPI:
             try:
                 print(f"토큰 발급 시도 {attempt + 1}/{max_retries}")
 
-                response = requests.post(
+                response = self.session.post(
                     url,
                     headers=headers,
                     data=json.dumps(data),
@@ -110,24 +122,35 @@ class KISOpenAPI:
         for attempt in range(max_retries):
             try:
                 if method.upper() == 'GET':
-                    response = requests.get(
+                    response = self.session.get(
                         url,
                         headers=headers,
                         params=params,
                         timeout=timeout,
-                        verify=True
+                        verify=True,
+                        stream=False
                     )
                 elif method.upper() == 'POST':
-                    response = requests.post(
+                    response = self.session.post(
                         url,
                         headers=headers,
                         data=data,
                         timeout=timeout,
-                        verify=True
+                        verify=True,
+                        stream=False
                     )
                 else:
                     raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
 
+                # 속도 제한 응답이면 지수 백오프 후 재시도
+                # (EGW00201: KIS 초당 거래건수 초과)
+                if (response.status_code == 429 or b"EGW00201" in response.content) \
+                        and attempt < max_retries - 1:
+                    wait = 2 ** attempt + random.random() * 0.1
+                    print(f"속도 제한 응답, {wait:.1f}초 후 재시도 (시도 {attempt + 1}/{max_retries})")
+                    time.sleep(wait)
+                    continue
+
                 return response
 
             except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout) as e:
@@ -206,7 +229,7 @@ class KISOpenAPI:
             "CTX_AREA_NK100": ""
         }
 
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(url, headers=headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -247,7 +270,7 @@ class KISOpenAPI:
             "ORD_UNPR": price
         }
 
-        response = requests.post(url, headers=headers, data=json.dumps(data))
+        response = self.session.post(url, headers=headers, data=json.dumps(data))
 
         if response.status_code == 200:
             result = response.json()
@@ -287,7 +310,7 @@ class KISOpenAPI:
             "ORD_UNPR": price
         }
 
-        response = requests.post(url, headers=headers, data=json.dumps(data))
+        response = self.session.post(url, headers=headers, data=json.dumps(data))
 
         if response.status_code == 200:
             result = response.json()
@@ -325,7 +348,7 @@ class KISOpenAPI:
             "FID_ORG_ADJ_PRC": "0"
         }
 
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(url, headers=headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
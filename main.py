@@ -6,8 +6,27 @@
 import json
 import os
 from datetime import datetime
-from strategy import AutoTradingStrategy
-from api import KISOpenAPI
+from functools import lru_cache
+from pathlib import Path
+
+# strategy/api는 pandas·numpy를 끌고 오므로 실제 사용 시점에 임포트
+# (설정 생성이나 사용법 출력만 할 때는 그 비용을 내지 않음)
+
+# orjson이 설치되어 있으면 사용 (stdlib json 대비 수 배 빠른 인코딩/디코딩)
+try:
+    import orjson
+
+    def _json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _json_loads(data):
+        return json.loads(data)
 
 
 # 설정 파일 (config.json)을 생성하고 사용하는 예제
@@ -36,21 +55,40 @@ def create_config_file():
         }
     }
 
-    with open('config.json', 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    Path('config.json').write_bytes(_json_dumps_pretty(config))
 
     print("config.json 파일이 생성되었습니다.")
     print("API 키와 계좌번호를 설정해주세요.")
 
 
+# 설정 파일 캐시 (mtime이 같으면 재파싱 생략)
+_CFG_CACHE = {'mtime': None, 'data': None}
+
+
 def load_config():
-    """설정 파일 로드"""
+    """설정 파일 로드 (mtime 기반 캐시)"""
     if not os.path.exists('config.json'):
         create_config_file()
         return None
 
-    with open('config.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    mtime = os.stat('config.json').st_mtime_ns
+    if mtime != _CFG_CACHE['mtime']:
+        _CFG_CACHE['data'] = _json_loads(Path('config.json').read_bytes())
+        _CFG_CACHE['mtime'] = mtime
+
+    return _CFG_CACHE['data']
+
+
+@lru_cache(maxsize=1)
+def _get_api(app_key, app_secret, account_no, is_real):
+    """동일 자격증명의 KISOpenAPI 인스턴스 공유
+
+    헬퍼마다 새로 생성하면 토큰 발급(tokenP)과 TLS 핸드셰이크를
+    반복하므로, 한 번 만든 인스턴스(세션+토큰)를 재사용한다.
+    """
+    from api import KISOpenAPI
+
+    return KISOpenAPI(app_key, app_secret, account_no, is_real)
 
 
 def validate_config(config):
@@ -83,14 +121,11 @@ def main():
         return
 
     try:
+        from strategy import AutoTradingStrategy
+
         # API 초기화
         print("API 연결 중...")
-        api = KISOpenAPI(
-            app_key=config['api_credentials']['app_key'],
-            app_secret=config['api_credentials']['app_secret'],
-            account_no=config['api_credentials']['account_no'],
-            is_real=config['api_credentials']['is_real']
-        )
+        api = _get_api(**config['api_credentials'])
 
         print("API 연결 성공!")
 
@@ -166,10 +201,6 @@ def main():
         print(f"오류 발생: {e}")
 
 
-if __name__ == "__main__":
-    main()
-
-
 # 사용 예제 및 테스트 함수들
 
 def test_api_connection():
@@ -179,12 +210,7 @@ def test_api_connection():
         return
 
     try:
-        api = KISOpenAPI(
-            app_key=config['api_credentials']['app_key'],
-            app_secret=config['api_credentials']['app_secret'],
-            account_no=config['api_credentials']['account_no'],
-            is_real=config['api_credentials']['is_real']
-        )
+        api = _get_api(**config['api_credentials'])
 
         # 삼성전자 현재가 조회 테스트
         price_info = api.get_current_price("005930")
@@ -207,6 +233,8 @@ def backtest_strategy(start_date, end_date):
 # 추가 유틸리티 함수들
 def get_market_status():
     """장 상태 확인"""
+    from strategy import AutoTradingStrategy
+
     strategy = AutoTradingStrategy(None, {})
     is_open = strategy.is_market_open()
     print(f"현재 장 상태: {'개장' if is_open else '폐장'}")
@@ -218,12 +246,7 @@ def monitor_watchlist():
     if not config or not validate_config(config):
         return
 
-    api = KISOpenAPI(
-        app_key=config['api_credentials']['app_key'],
-        app_secret=config['api_credentials']['app_secret'],
-        account_no=config['api_credentials']['account_no'],
-        is_real=config['api_credentials']['is_real']
-    )
+    api = _get_api(**config['api_credentials'])
 
     watchlist = config['trading_config']['watchlist']
 
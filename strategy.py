@@ -1,12 +1,29 @@
+import asyncio
+import atexit
+import hashlib
 import pandas as pd
 import numpy as np
 import time
 import schedule
+from concurrent.futures import ThreadPoolExecutor
+from async_api import AsyncKISOpenAPI
 from datetime import datetime, timedelta
+from datetime import time as dt_time
+from pathlib import Path
 import logging
+import logging.handlers
 
 
 class AutoTradingStrategy:
+    # 장 운영 시간 (매 호출마다 strptime으로 파싱하지 않도록 상수화)
+    MARKET_OPEN = dt_time(9, 0)
+    MARKET_CLOSE = dt_time(15, 30)
+
+    # 일봉 이력 디스크 캐시 (틱마다 30봉 전체를 다시 받지 않기 위함)
+    CHART_CACHE_DIR = Path('cache')
+    CHART_CACHE_BARS = 60  # 종목당 디스크에 보관할 봉 개수
+    CHART_BARS = 30  # 분석에 사용하는 봉 개수 (기존 전체 조회 개수와 동일)
+
     def __init__(self, kis_api, config):
         """
         자동매매 전략 클래스
@@ -23,48 +40,61 @@ class AutoTradingStrategy:
         self.stop_loss_ratio = config.get('stop_loss_ratio', 0.05)  # 손절 비율
         self.take_profit_ratio = config.get('take_profit_ratio', 0.1)  # 익절 비율
 
-        # 로깅 설정
+        # 분석 결과 캐시: 보유 종목이 관심종목에도 있으면 한 틱에 두 번
+        # 분석(시세+차트 API 호출 2회)하게 되는 중복을 제거
+        self._analysis_cache = {}
+        self._analysis_ttl = 60  # 초
+
+        # 잔고 응답이 바뀌지 않은 틱에서 포트폴리오 재구성을 건너뛰기
+        # 위한 원시 응답 해시와 직전 결과
+        self._balance_hash = None
+        self._portfolio_cache = None
+
+        # 로깅 설정: 파일 기록은 MemoryHandler로 버퍼링해 100건마다
+        # (또는 ERROR 발생 즉시) 한 번에 쓴다. 콘솔 출력은 즉시.
+        file_handler = logging.FileHandler('trading.log')
+        file_handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self._log_handler = logging.handlers.MemoryHandler(
+            100, flushLevel=logging.ERROR, target=file_handler)
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler('trading.log'),
+                self._log_handler,
                 logging.StreamHandler()
             ]
         )
         self.logger = logging.getLogger(__name__)
+        atexit.register(self._log_handler.flush)  # 종료 시 잔여 버퍼 기록
 
     def is_market_open(self):
-        """장 시간 확인"""
+        """장 시간 확인 (주말 제외, 09:00 ~ 15:30)"""
         now = datetime.now()
-        weekday = now.weekday()
-        current_time = now.time()
-
-        # 주말 제외
-        if weekday >= 5:  # 토요일(5), 일요일(6)
-            return False
-
-        # 장 시간: 09:00 ~ 15:30
-        market_open = datetime.strptime("09:00", "%H:%M").time()
-        market_close = datetime.strptime("15:30", "%H:%M").time()
-
-        return market_open <= current_time <= market_close
+        # 토요일(5), 일요일(6) 제외
+        return now.weekday() < 5 and self.MARKET_OPEN <= now.time() <= self.MARKET_CLOSE
 
     def calculate_moving_average(self, prices, period):
-        """이동평균 계산"""
-        return sum(prices[-period:]) / period if len(prices) >= period else None
+        """이동평균 계산 (numpy 벡터 연산)"""
+        if len(prices) < period:
+            return None
+        return float(np.mean(np.asarray(prices[-period:], dtype=np.float64)))
 
     def calculate_rsi(self, prices, period=14):
-        """RSI 계산"""
+        """RSI 계산 (numpy 벡터 연산)
+
+        파이썬 리스트 컴프리헨션 3개 대신 np.diff + clip으로
+        C 레벨에서 일괄 계산한다.
+        """
         if len(prices) < period + 1:
             return None
 
-        deltas = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
-        gains = [delta if delta > 0 else 0 for delta in deltas]
-        losses = [-delta if delta < 0 else 0 for delta in deltas]
-
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
+        arr = np.asarray(prices[-(period + 1):], dtype=np.float64)
+        deltas = np.diff(arr)
+        # clip 두 번(상승분/하락분 각각) 대신 마스크 한 번으로 분리
+        mask = deltas > 0
+        avg_gain = deltas[mask].sum() / period
+        avg_loss = -deltas[~mask].sum() / period
 
         if avg_loss == 0:
             return 100
@@ -73,46 +103,227 @@ class AutoTradingStrategy:
         rsi = 100 - (100 / (1 + rs))
         return rsi
 
-    def analyze_stock(self, stock_code):
-        """종목 분석"""
+    def _load_chart_history(self, stock_code):
+        """일봉 이력 로드 (디스크 캐시 + 증분 조회)
+
+        캐시가 있으면 마지막 봉 이후의 신규 봉만 API로 받아와 이어붙인다.
+        같은 거래일 안에서는 신규 봉이 없어 네트워크 왕복 한 번으로 끝난다.
+        최신 봉이 먼저 오는 KIS 응답 순서를 그대로 유지한다.
+
+        디스크에는 최대 CHART_CACHE_BARS개를 보관하되, 반환은 항상 최신
+        CHART_BARS개로 제한한다 (캐시 도입 전의 30봉 조회와 동일한
+        구간을 지표 계산에 쓰기 위함 — 아니면 캐시가 자라면서 [-5:]
+        같은 꼬리 슬라이스가 가리키는 봉이 달라져 신호가 변한다).
+        """
+        cache_path = self.CHART_CACHE_DIR / f"{stock_code}.csv"
+
+        cached = None
+        if cache_path.exists():
+            try:
+                cached = pd.read_csv(cache_path, dtype={'date': str})
+            except (OSError, ValueError):
+                cached = None
+            else:
+                # CSV로는 읽히지만 필요한 컬럼이 없는 손상 파일은 버리고
+                # 전체 조회로 떨어뜨린다 (조회 성공 시 파일도 재작성됨)
+                if not {'date', 'close', 'volume'}.issubset(cached.columns):
+                    cached = None
+
+        if cached is not None and len(cached) > 0:
+            last_date = cached['date'].max()
+            new_rows = self.api.get_chart_data(
+                stock_code, period="D", count=self.CHART_BARS, since=last_date)
+            if not new_rows:
+                return cached.head(self.CHART_BARS)
+            new_df = pd.DataFrame(new_rows)
+            if len(new_df) >= self.CHART_BARS:
+                # 캐시가 30거래일 이상 묵어 증분 응답이 잘렸을 수 있는
+                # 경우: 이어붙이면 중간에 빈 구간이 생기므로 방금 받은
+                # 최신 봉 전체로 캐시를 대체한다
+                df = new_df
+            else:
+                df = pd.concat([new_df, cached], ignore_index=True)
+                df = (df.drop_duplicates('date')
+                        .sort_values('date', ascending=False)
+                        .head(self.CHART_CACHE_BARS))
+        else:
+            rows = self.api.get_chart_data(
+                stock_code, period="D", count=self.CHART_BARS)
+            if not rows:
+                return None
+            df = pd.DataFrame(rows)
+
+        try:
+            self.CHART_CACHE_DIR.mkdir(exist_ok=True)
+            df.to_csv(cache_path, index=False)
+        except OSError:
+            pass  # 캐시 저장 실패는 치명적이지 않음
+
+        return df.head(self.CHART_BARS)
+
+    def get_cached_analysis(self, stock_code, current_info=None):
+        """종목 분석 (60초 이내 결과 재사용)"""
+        entry = self._analysis_cache.get(stock_code)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < self._analysis_ttl:
+            return entry[1]
+
+        analysis = self.analyze_stock(stock_code, current_info)
+        self._analysis_cache[stock_code] = (now, analysis)
+        return analysis
+
+    def analyze_stock(self, stock_code, current_info=None):
+        """종목 분석
+
+        Args:
+            stock_code: 종목코드
+            current_info: 미리 조회한 현재가 정보 (없으면 개별 조회)
+        """
         try:
             # 현재가 정보
-            current_info = self.api.get_current_price(stock_code)
+            if current_info is None:
+                current_info = self.api.get_current_price(stock_code)
             if not current_info:
                 return None
 
-            # 차트 데이터 (최근 30일)
-            chart_data = self.api.get_chart_data(stock_code, period="D", count=30)
-            if not chart_data:
+            # 차트 데이터 (디스크 캐시 + 증분 조회)
+            chart_df = self._load_chart_history(stock_code)
+            if chart_df is None or len(chart_df) == 0:
                 return None
 
-            closes = [data['close'] for data in chart_data]
-            volumes = [data['volume'] for data in chart_data]
+            closes = chart_df['close'].to_numpy()
+            volumes = chart_df['volume'].to_numpy()
+
+            return self._build_analysis(stock_code, current_info, closes, volumes)
+
+        except Exception as e:
+            self.logger.error("종목 분석 오류 %s: %s", stock_code, e)
+            return None
+
+    def _build_analysis(self, stock_code, current_info, closes, volumes):
+        """시세 정보와 종가/거래량 배열로 분석 결과 구성 (동기/비동기 공용)"""
+        ma5 = self.calculate_moving_average(closes, 5)
+        ma20 = self.calculate_moving_average(closes, 20)
+        rsi = self.calculate_rsi(closes)
+
+        avg_volume = sum(volumes[-5:]) / 5  # 최근 5일 평균 거래량
+
+        return {
+            'stock_code': stock_code,
+            'current_price': current_info['current_price'],
+            'change_rate': current_info['change_rate'],
+            'volume': current_info['volume'],
+            'avg_volume': avg_volume,
+            'ma5': ma5,
+            'ma20': ma20,
+            'rsi': rsi,
+            'volume_ratio': current_info['volume'] / avg_volume if avg_volume > 0 else 0
+        }
+
+    @staticmethod
+    def _analyze_batch(closes):
+        """(종목 수, 21) 종가 행렬에서 MA5/MA20/RSI 일괄 계산
+
+        종목별 파이썬 루프 대신 행렬 연산 세 번으로 전 종목의 지표를
+        한 번에 구한다. 열은 각 종목의 마지막 21개 봉 (MA20과
+        RSI14의 최소 요구치를 모두 충족하는 폭).
+        """
+        ma5 = closes[:, -5:].mean(axis=1)
+        ma20 = closes[:, -20:].mean(axis=1)
+
+        deltas = np.diff(closes[:, -15:], axis=1)
+        gains = deltas.clip(min=0).mean(axis=1)
+        losses = (-deltas).clip(min=0).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+
+        return ma5, ma20, rsi
 
-            # 기술적 분석
-            ma5 = self.calculate_moving_average(closes, 5)
-            ma20 = self.calculate_moving_average(closes, 20)
-            rsi = self.calculate_rsi(closes)
+    def analyze_stocks_batch(self, stock_codes, quotes):
+        """여러 종목 일괄 분석 후 결과를 분석 캐시에 적재
+
+        차트 이력을 스레드 풀로 동시에 로드한 뒤, 봉이 충분한 종목은
+        종목×봉 행렬 한 번의 벡터 연산으로 지표를 계산한다. 봉이
+        부족한 종목(신규 상장 등)은 기존 개별 경로로 계산한다.
+
+        Args:
+            stock_codes: 종목코드 리스트
+            quotes: 종목코드 -> get_current_price 결과 딕셔너리
+        """
+        # 종목별로 실패를 격리: 한 종목의 차트 요청이 예외를 던져도
+        # (네트워크 오류 등) 해당 종목만 건너뛰고 나머지는 계속 분석한다
+        # — 특히 보유 종목의 손절 검토가 무관한 종목 때문에 막히면 안 됨
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {code: executor.submit(self._load_chart_history, code)
+                       for code in stock_codes}
+
+        hists = {}
+        for code, future in futures.items():
+            try:
+                hists[code] = future.result()
+            except Exception as e:
+                self.logger.error("종목 분석 오류 %s: %s", code, e)
+                hists[code] = None
+
+        now = time.monotonic()
+        batch = []
+        for code in stock_codes:
+            df = hists.get(code)
+            info = quotes.get(code)
+            if df is None or len(df) == 0 or info is None:
+                self._analysis_cache[code] = (now, None)
+                continue
+
+            closes = df['close'].to_numpy()
+            volumes = df['volume'].to_numpy()
+            if len(closes) >= 21:
+                batch.append((code, info, closes, volumes))
+            else:
+                self._analysis_cache[code] = (
+                    now, self._build_analysis(code, info, closes, volumes))
+
+        if batch:
+            matrix = np.stack(
+                [closes[-21:] for _, _, closes, _ in batch]).astype(np.float64)
+            ma5s, ma20s, rsis = self._analyze_batch(matrix)
+            for i, (code, info, closes, volumes) in enumerate(batch):
+                avg_volume = float(volumes[-5:].mean())
+                self._analysis_cache[code] = (now, {
+                    'stock_code': code,
+                    'current_price': info['current_price'],
+                    'change_rate': info['change_rate'],
+                    'volume': info['volume'],
+                    'avg_volume': avg_volume,
+                    'ma5': float(ma5s[i]),
+                    'ma20': float(ma20s[i]),
+                    'rsi': float(rsis[i]),
+                    'volume_ratio': info['volume'] / avg_volume if avg_volume > 0 else 0
+                })
+
+    async def analyze_stock_async(self, stock_code, async_api):
+        """종목 분석 (비동기)
+
+        현재가와 차트를 asyncio.gather로 동시에 받아 종목당 지연을
+        두 요청의 합이 아닌 최댓값으로 줄인다.
 
-            current_price = current_info['current_price']
-            avg_volume = sum(volumes[-5:]) / 5  # 최근 5일 평균 거래량
+        Args:
+            stock_code: 종목코드
+            async_api: AsyncKISOpenAPI 인스턴스
+        """
+        try:
+            current_info, chart_data = await asyncio.gather(
+                async_api.get_current_price(stock_code),
+                async_api.get_chart_data(stock_code, "D", 30))
+            if not current_info or not chart_data:
+                return None
 
-            analysis = {
-                'stock_code': stock_code,
-                'current_price': current_price,
-                'change_rate': current_info['change_rate'],
-                'volume': current_info['volume'],
-                'avg_volume': avg_volume,
-                'ma5': ma5,
-                'ma20': ma20,
-                'rsi': rsi,
-                'volume_ratio': current_info['volume'] / avg_volume if avg_volume > 0 else 0
-            }
+            closes = np.array([d['close'] for d in chart_data], dtype=np.int64)
+            volumes = np.array([d['volume'] for d in chart_data], dtype=np.int64)
 
-            return analysis
+            return self._build_analysis(stock_code, current_info, closes, volumes)
 
         except Exception as e:
-            self.logger.error(f"종목 분석 오류 {stock_code}: {e}")
+            self.logger.error("종목 분석 오류 %s: %s", stock_code, e)
             return None
 
     def should_buy(self, analysis):
@@ -120,18 +331,19 @@ class AutoTradingStrategy:
         if not analysis or not all([analysis['ma5'], analysis['ma20'], analysis['rsi']]):
             return False
 
-        conditions = [
+        # 리스트 생성 없이 불리언 합산 (4개 조건 중 3개 이상 만족)
+        satisfied = (
             # 골든크로스: 5일선이 20일선 위에 있음
-            analysis['ma5'] > analysis['ma20'],
+            (analysis['ma5'] > analysis['ma20'])
             # RSI가 과매도 구간에서 벗어남 (30 이상)
-            analysis['rsi'] > 30 and analysis['rsi'] < 70,
+            + (30 < analysis['rsi'] < 70)
             # 거래량이 평균의 1.5배 이상
-            analysis['volume_ratio'] > 1.5,
+            + (analysis['volume_ratio'] > 1.5)
             # 하락률이 3% 이내
-            analysis['change_rate'] > -3.0
-        ]
+            + (analysis['change_rate'] > -3.0)
+        )
 
-        return sum(conditions) >= 3  # 4개 조건 중 3개 이상 만족
+        return satisfied >= 3
 
     def should_sell(self, analysis, holding_info):
         """매도 신호 판단"""
@@ -140,46 +352,67 @@ class AutoTradingStrategy:
 
         current_price = analysis['current_price']
         buy_price = holding_info['buy_price']
+        ma5 = analysis['ma5']
+        ma20 = analysis['ma20']
+        rsi = analysis['rsi']
 
         # 수익률 계산
         profit_rate = (current_price - buy_price) / buy_price
 
-        conditions = [
+        return (
             # 손절: 5% 이상 손실
-            profit_rate <= -self.stop_loss_ratio,
+            profit_rate <= -self.stop_loss_ratio
             # 익절: 10% 이상 수익
-            profit_rate >= self.take_profit_ratio,
+            or profit_rate >= self.take_profit_ratio
             # 데드크로스: 5일선이 20일선 아래로
-            analysis['ma5'] and analysis['ma20'] and analysis['ma5'] < analysis['ma20'],
+            or bool(ma5 and ma20 and ma5 < ma20)
             # RSI 과매수 구간
-            analysis['rsi'] and analysis['rsi'] > 80
-        ]
-
-        return any(conditions)
+            or bool(rsi and rsi > 80)
+        )
 
     def get_portfolio_status(self):
-        """포트폴리오 현황 조회"""
-        balance = self.api.get_balance()
+        """포트폴리오 현황 조회
+
+        체결이 없는 틱 사이에는 잔고 응답이 바이트 단위로 동일하므로,
+        원시 응답을 해시해 같으면 직전 결과를 그대로 반환하고
+        파싱과 딕셔너리 재구성을 생략한다.
+        """
+        raw = self.api.get_balance_raw()
+        if raw is None:
+            return None
+
+        balance_hash = hashlib.blake2b(raw, digest_size=8).digest()
+        if balance_hash == self._balance_hash:
+            return self._portfolio_cache
+
+        balance = self.api.parse_balance(raw)
         if not balance:
             return None
 
         cash = balance['cash']
         holdings = {}
 
-        for stock in balance['stocks']:
-            if int(stock['hldg_qty']) > 0:  # 보유수량이 있는 경우
-                holdings[stock['pdno']] = {
-                    'quantity': int(stock['hldg_qty']),
-                    'buy_price': int(stock['pchs_avg_pric']),
-                    'current_value': int(stock['evlu_amt']),
-                    'profit_loss': int(stock['evlu_pfls_amt'])
-                }
-
-        return {
+        df = balance['stocks']
+        if len(df) > 0:
+            # 행마다 int() 4회 대신 컬럼 단위 일괄 캐스팅 + 벡터 필터
+            num_cols = ['hldg_qty', 'pchs_avg_pric', 'evlu_amt', 'evlu_pfls_amt']
+            df = df[['pdno'] + num_cols].astype({col: 'int64' for col in num_cols})
+            df = df[df['hldg_qty'] > 0]  # 보유수량이 있는 경우
+            df = df.rename(columns={
+                'hldg_qty': 'quantity',
+                'pchs_avg_pric': 'buy_price',
+                'evlu_amt': 'current_value',
+                'evlu_pfls_amt': 'profit_loss'
+            })
+            holdings = df.set_index('pdno').to_dict('index')
+
+        self._balance_hash = balance_hash
+        self._portfolio_cache = {
             'cash': cash,
             'holdings': holdings,
             'position_count': len(holdings)
         }
+        return self._portfolio_cache
 
     def calculate_position_size(self, stock_price, available_cash):
         """포지션 크기 계산"""
@@ -194,16 +427,18 @@ class AutoTradingStrategy:
 
         return max(quantity, 0)
 
-    def execute_buy_order(self, stock_code, analysis):
-        """매수 주문 실행"""
-        try:
-            portfolio = self.get_portfolio_status()
-            if not portfolio:
-                return False
+    def execute_buy_order(self, stock_code, analysis, portfolio):
+        """매수 주문 실행
 
+        Args:
+            stock_code: 종목코드
+            analysis: analyze_stock 결과
+            portfolio: 현재 틱의 포트폴리오 (호출자가 조회/갱신 관리)
+        """
+        try:
             # 이미 보유중인지 확인
             if stock_code in portfolio['holdings']:
-                self.logger.info(f"{stock_code} 이미 보유중")
+                self.logger.info("%s 이미 보유중", stock_code)
                 return False
 
             # 최대 포지션 수 확인
@@ -225,14 +460,24 @@ class AutoTradingStrategy:
             result = self.api.buy_order(stock_code, quantity, price=0)
 
             if result['success']:
-                self.logger.info(f"매수 주문 성공: {stock_code}, 수량: {quantity}")
+                # 잔고 재조회 대신 로컬 포트폴리오를 갱신
+                buy_price = analysis['current_price']
+                portfolio['cash'] -= quantity * buy_price
+                portfolio['position_count'] += 1
+                portfolio['holdings'][stock_code] = {
+                    'quantity': quantity,
+                    'buy_price': buy_price,
+                    'current_value': quantity * buy_price,
+                    'profit_loss': 0
+                }
+                self.logger.info("매수 주문 성공: %s, 수량: %d", stock_code, quantity)
                 return True
             else:
-                self.logger.error(f"매수 주문 실패: {result['message']}")
+                self.logger.error("매수 주문 실패: %s", result['message'])
                 return False
 
         except Exception as e:
-            self.logger.error(f"매수 주문 오류: {e}")
+            self.logger.error("매수 주문 오류: %s", e)
             return False
 
     def execute_sell_order(self, stock_code, holding_info):
@@ -245,14 +490,15 @@ class AutoTradingStrategy:
 
             if result['success']:
                 profit_loss = holding_info['profit_loss']
-                self.logger.info(f"매도 주문 성공: {stock_code}, 수량: {quantity}, 손익: {profit_loss:,}원")
+                self.logger.info("매도 주문 성공: %s, 수량: %d, 손익: %s원",
+                                 stock_code, quantity, format(profit_loss, ','))
                 return True
             else:
-                self.logger.error(f"매도 주문 실패: {result['message']}")
+                self.logger.error("매도 주문 실패: %s", result['message'])
                 return False
 
         except Exception as e:
-            self.logger.error(f"매도 주문 오류: {e}")
+            self.logger.error("매도 주문 오류: %s", e)
             return False
 
     def run_strategy(self):
@@ -270,34 +516,174 @@ class AutoTradingStrategy:
                 self.logger.error("포트폴리오 조회 실패")
                 return
 
-            self.logger.info(f"현금: {portfolio['cash']:,}원, 보유종목: {portfolio['position_count']}개")
+            self.logger.info("현금: %s원, 보유종목: %d개",
+                             format(portfolio['cash'], ','), portfolio['position_count'])
+
+            # 보유 ∪ 관심 종목의 현재가를 한 번에 선조회한 뒤 지표를
+            # 종목×봉 행렬로 일괄 계산해 분석 캐시에 적재
+            unique_codes = list(dict.fromkeys(
+                list(portfolio['holdings']) + self.watchlist))
+            quotes = {q['stock_code']: q
+                      for q in self.api.get_current_prices(unique_codes) if q}
+            self.analyze_stocks_batch(unique_codes, quotes)
 
-            # 보유 종목 매도 검토
-            for stock_code, holding_info in portfolio['holdings'].items():
-                analysis = self.analyze_stock(stock_code)
+            # 보유 종목 매도 검토 (매도 성공 시 로컬 포트폴리오 갱신)
+            for stock_code, holding_info in list(portfolio['holdings'].items()):
+                analysis = self.get_cached_analysis(stock_code)
                 if analysis and self.should_sell(analysis, holding_info):
-                    self.execute_sell_order(stock_code, holding_info)
-                    time.sleep(1)  # API 호출 간격
+                    if self.execute_sell_order(stock_code, holding_info):
+                        portfolio['cash'] += holding_info['current_value']
+                        portfolio['position_count'] -= 1
+                        del portfolio['holdings'][stock_code]
 
-            # 관심종목 매수 검토
+            # 관심종목 매수 검토 (분석은 위에서 캐시됨)
             for stock_code in self.watchlist:
-                analysis = self.analyze_stock(stock_code)
+                analysis = self.get_cached_analysis(stock_code)
                 if analysis and self.should_buy(analysis):
-                    self.execute_buy_order(stock_code, analysis)
-                    time.sleep(1)  # API 호출 간격
+                    self.execute_buy_order(stock_code, analysis, portfolio)
 
         except Exception as e:
-            self.logger.error(f"전략 실행 오류: {e}")
+            self.logger.error("전략 실행 오류: %s", e)
 
         self.logger.info("=== 자동매매 전략 실행 완료 ===")
 
+    async def run_strategy_async(self):
+        """전략 실행 (비동기)
+
+        종목 분석을 asyncio.gather로 동시에 수행하므로 관심종목 전체의
+        분석 시간이 요청 지연의 합이 아닌 최댓값 수준으로 줄어든다.
+        동시 요청 수는 AsyncKISOpenAPI의 세마포어로 제한된다.
+        """
+        if not self.is_market_open():
+            self.logger.info("장 시간이 아닙니다.")
+            return
+
+        self.logger.info("=== 자동매매 전략 실행 시작 (async) ===")
+
+        # 클라이언트는 이벤트 루프에 묶이므로 실행마다 생성/종료
+        async_api = AsyncKISOpenAPI(
+            self.api.app_key, self.api.app_secret,
+            self.api.account_no, self.api.is_real)
+
+        try:
+            # 잔고 조회는 동기 API뿐이라 스레드로 위임
+            portfolio = await asyncio.to_thread(self.get_portfolio_status)
+            if not portfolio:
+                self.logger.error("포트폴리오 조회 실패")
+                return
+
+            self.logger.info("현금: %s원, 보유종목: %d개",
+                             format(portfolio['cash'], ','), portfolio['position_count'])
+
+            # 동기 API의 토큰을 공유 (틱마다 tokenP를 새로 호출하면
+            # KIS의 발급 제한에 걸리고 기존 토큰이 무효화될 수 있음;
+            # 방금의 잔고 조회에서 _ensure_token이 만료 전 갱신을 보장)
+            async_api.access_token = self.api.access_token
+            async_api.token_expired = self.api.token_expired
+
+            # 보유 ∪ 관심 종목을 동시에 분석
+            unique_codes = list(dict.fromkeys(
+                list(portfolio['holdings']) + self.watchlist))
+            results = await asyncio.gather(
+                *(self.analyze_stock_async(code, async_api) for code in unique_codes))
+            analyses = dict(zip(unique_codes, results))
+
+            # 보유 종목 매도 검토 (매도 성공 시 로컬 포트폴리오 갱신)
+            for stock_code, holding_info in list(portfolio['holdings'].items()):
+                analysis = analyses.get(stock_code)
+                if analysis and self.should_sell(analysis, holding_info):
+                    result = await async_api.sell_order(
+                        stock_code, holding_info['quantity'], price=0)
+                    if result['success']:
+                        self.logger.info(
+                            "매도 주문 성공: %s, 수량: %d, 손익: %s원",
+                            stock_code, holding_info['quantity'],
+                            format(holding_info['profit_loss'], ','))
+                        portfolio['cash'] += holding_info['current_value']
+                        portfolio['position_count'] -= 1
+                        del portfolio['holdings'][stock_code]
+                    else:
+                        self.logger.error("매도 주문 실패: %s", result['message'])
+
+            # 관심종목 매수 검토
+            for stock_code in self.watchlist:
+                analysis = analyses.get(stock_code)
+                if not (analysis and self.should_buy(analysis)):
+                    continue
+                if stock_code in portfolio['holdings']:
+                    self.logger.info("%s 이미 보유중", stock_code)
+                    continue
+                if portfolio['position_count'] >= self.max_position_count:
+                    self.logger.info("최대 포지션 수 초과")
+                    continue
+
+                quantity = self.calculate_position_size(
+                    analysis['current_price'], portfolio['cash'])
+                if quantity <= 0:
+                    self.logger.info("주문 수량 부족")
+                    continue
+
+                result = await async_api.buy_order(stock_code, quantity, price=0)
+                if result['success']:
+                    buy_price = analysis['current_price']
+                    portfolio['cash'] -= quantity * buy_price
+                    portfolio['position_count'] += 1
+                    portfolio['holdings'][stock_code] = {
+                        'quantity': quantity,
+                        'buy_price': buy_price,
+                        'current_value': quantity * buy_price,
+                        'profit_loss': 0
+                    }
+                    self.logger.info("매수 주문 성공: %s, 수량: %d", stock_code, quantity)
+                else:
+                    self.logger.error("매수 주문 실패: %s", result['message'])
+
+        except Exception as e:
+            self.logger.error("전략 실행 오류: %s", e)
+        finally:
+            await async_api.aclose()
+
+        self.logger.info("=== 자동매매 전략 실행 완료 (async) ===")
+
+    def run_strategy_once_async(self):
+        """run_strategy_async의 동기 진입점"""
+        asyncio.run(self.run_strategy_async())
+
+    def _start_intraday(self):
+        """장중 5분 주기 작업 등록 (등록 직후 1회 즉시 실행, 주말 제외)"""
+        if self._intraday_job is None and self.is_market_open():
+            self._intraday_job = schedule.every(5).minutes.do(self.run_strategy)
+            self.run_strategy()
+
+    def _stop_intraday(self):
+        """장 마감 시 장중 작업 해제"""
+        if self._intraday_job is not None:
+            schedule.cancel_job(self._intraday_job)
+            self._intraday_job = None
+
     def start_scheduler(self):
-        """스케줄러 시작"""
-        # 장 시간 중 5분마다 실행
-        schedule.every(5).minutes.do(self.run_strategy)
+        """스케줄러 시작
+
+        5분 작업을 하루 종일 돌려놓고 run_strategy 안에서 장외 여부를
+        확인하는 대신, 개장/마감 시각에만 장중 작업을 등록/해제해
+        야간·주말의 불필요한 기상을 없앤다.
+        """
+        self._intraday_job = None
+        schedule.every().day.at("09:00").do(self._start_intraday)
+        schedule.every().day.at("15:30").do(self._stop_intraday)
+
+        # 장중에 (재)시작된 경우 다음 개장을 기다리지 않고 바로 등록
+        if self.is_market_open():
+            self._start_intraday()
 
         self.logger.info("자동매매 스케줄러 시작")
 
+        # 고정 60초 폴링 대신 다음 작업까지 정확히 대기
+        # (불필요한 기상 제거 + 최대 60초의 실행 지연 해소)
         while True:
-            schedule.run_pending()
-            time.sleep(60)  # 1분마다 스케줄 확인
\ No newline at end of file
+            idle = schedule.idle_seconds()
+            if idle is None:
+                break  # 등록된 작업 없음
+            if idle > 0:
+                time.sleep(idle)
+            schedule.run_pending()
\ No newline at end of file